@@ -2,83 +2,130 @@
 """BDD-style end-to-end tests for Home Assistant"""
 import pytest
 from pytest_bdd import scenarios, given, when, then, parsers
+import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
+from urllib.parse import urlsplit
 
 
+HA_URL_DEFAULT = os.getenv('HA_URL', 'http://homeassistant:8123')
+MQTT_HOST = os.getenv('MQTT_HOST', 'mosquitto')
+
+pytestmark = pytest.mark.e2e
+
+# Built once at import; cfparse compiles its pattern up front
+PUBLISH_STEP = parsers.cfparse('I publish message "{message}" to topic "{topic}"')
+
 # Load BDD scenarios
 scenarios('../features/homeassistant.feature')
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def ha_url():
     """Home Assistant base URL"""
-    return os.getenv('HA_URL', 'http://homeassistant:8123')
+    return HA_URL_DEFAULT
 
 
-@pytest.fixture
-def ha_session(ha_url):
-    """HTTP session for Home Assistant"""
+@pytest.fixture(scope="session")
+def ha_session(ha_url, wait_port):
+    """HTTP session for Home Assistant, shared across all scenarios"""
     session = requests.Session()
     session.headers.update({
         'Content-Type': 'application/json'
     })
-    return session
+    # Transient gateway errors and connection resets are retried by urllib3
+    # with backoff, so the fixture needs no hand-rolled retry loop
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504]
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    # Wait for Home Assistant once per session rather than once per scenario.
+    # A cheap TCP probe goes first so the HTTP check only covers app startup.
+    url = urlsplit(ha_url)
+    if not wait_port(url.hostname, url.port or 80):
+        session.close()
+        pytest.fail("Home Assistant is not accessible")
+
+    try:
+        response = session.get(ha_url, timeout=5)
+    except requests.RequestException as e:
+        session.close()
+        pytest.fail(f"Home Assistant is not accessible: {e}")
+    if response.status_code not in [200, 401]:  # 401 means running but needs auth
+        session.close()
+        pytest.fail("Home Assistant is not accessible")
+
+    yield session
+    session.close()
 
 
 @given('Home Assistant is running')
-def home_assistant_running(ha_url, ha_session):
+def home_assistant_running(ha_session):
     """Verify Home Assistant is accessible"""
-    max_retries = 10
-    for attempt in range(max_retries):
-        try:
-            response = ha_session.get(ha_url, timeout=5)
-            if response.status_code in [200, 401]:  # 401 means running but needs auth
-                return True
-        except requests.RequestException:
-            if attempt < max_retries - 1:
-                time.sleep(3)
-            else:
-                raise
-    pytest.fail("Home Assistant is not accessible")
-
-
-@when('I check the Home Assistant API status')
+    # Readiness is established by the session-scoped ha_session fixture
+    return True
+
+
+@when('I check the Home Assistant API status', target_fixture="api_response")
 def check_api_status(ha_url, ha_session):
     """Check Home Assistant API status"""
-    response = ha_session.get(f"{ha_url}/api/", timeout=10)
-    assert response.status_code in [200, 401]
+    return ha_session.get(f"{ha_url}/api/", timeout=10)
 
 
 @then('the API should be responsive')
-def api_responsive(ha_url, ha_session):
+def api_responsive(api_response):
     """Verify API responds"""
-    response = ha_session.get(f"{ha_url}/api/", timeout=10)
-    assert response.status_code in [200, 401]
+    assert api_response.status_code in [200, 401]
+
+
+@pytest.fixture(scope="session")
+def mqtt_bdd_client():
+    """MQTT client connected once and shared across all scenarios"""
+    # MQTT v5 with a persistent session lets the broker keep subscriptions
+    # and in-flight messages between runs instead of rebuilding them
+    worker = os.getenv('PYTEST_XDIST_WORKER', 'master')
+    client = mqtt.Client(client_id=f"pytest-bdd-{worker}", protocol=mqtt.MQTTv5)
+    properties = Properties(PacketTypes.CONNECT)
+    properties.SessionExpiryInterval = 60
+    try:
+        client.connect(
+            MQTT_HOST,
+            1883,
+            keepalive=60,
+            clean_start=False,
+            properties=properties
+        )
+    except Exception as e:
+        pytest.fail(f"MQTT broker not accessible: {e}")
+    client.loop_start()
+    yield client
+    client.loop_stop()
+    client.disconnect()
 
 
 @given('MQTT broker is running')
-def mqtt_broker_running():
+def mqtt_broker_running(mqtt_bdd_client):
     """Verify MQTT broker is accessible"""
-    import paho.mqtt.client as mqtt
-    client = mqtt.Client()
-    try:
-        client.connect(os.getenv('MQTT_HOST', 'mosquitto'), 1883, 60)
-        client.disconnect()
-        return True
-    except Exception as e:
-        pytest.fail(f"MQTT broker not accessible: {e}")
+    # Connectivity is established by the session-scoped mqtt_bdd_client fixture
+    return True
 
 
-@when(parsers.parse('I publish message "{message}" to topic "{topic}"'))
-def publish_mqtt_message(message, topic):
+@when(PUBLISH_STEP)
+def publish_mqtt_message(mqtt_bdd_client, message, topic):
     """Publish MQTT message"""
-    import paho.mqtt.client as mqtt
-    client = mqtt.Client()
-    client.connect(os.getenv('MQTT_HOST', 'mosquitto'), 1883, 60)
-    client.publish(topic, message)
-    client.disconnect()
+    mqtt_bdd_client.publish(topic, message)
 
 
 @then('the message should be delivered successfully')
@@ -0,0 +1,97 @@
+# tests/e2e/test_observability_stack.py
+"""End-to-end tests for observability stack"""
+import pytest
+import requests
+import time
+
+
+pytestmark = pytest.mark.e2e
+
+
+@pytest.fixture(scope="session")
+def prometheus_url():
+    return "http://prometheus:9090"
+
+
+@pytest.fixture(scope="session")
+def grafana_url():
+    return "http://grafana:3000"
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """Keep-alive HTTP session shared by all observability checks"""
+    session = requests.Session()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def grafana_session():
+    """Keep-alive HTTP session authenticated against Grafana once"""
+    session = requests.Session()
+    session.auth = ('admin', 'changeme')
+    yield session
+    session.close()
+
+
+def test_prometheus_targets_healthy(http_session, prometheus_url):
+    """Test that Prometheus can scrape all targets"""
+    # Poll instead of sleeping a fixed time so a warm Prometheus passes at once
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if http_session.get(f"{prometheus_url}/-/ready", timeout=2).status_code == 200:
+                break
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    
+    # Wait for the initial scrape to mark at least one target healthy
+    while True:
+        response = http_session.get(f"{prometheus_url}/api/v1/targets")
+        assert response.status_code == 200
+        
+        data = response.json()
+        active_targets = data['data']['activeTargets']
+        healthy_targets = [t for t in active_targets if t['health'] == 'up']
+        if healthy_targets or time.monotonic() >= deadline:
+            break
+        time.sleep(0.25)
+    
+    # Check that we have targets configured
+    assert len(active_targets) > 0
+    
+    # Check for healthy targets
+    assert len(healthy_targets) > 0
+
+
+def test_grafana_datasources_configured(grafana_session, grafana_url):
+    """Test that Grafana has datasources configured"""
+    response = grafana_session.get(f"{grafana_url}/api/health")
+    assert response.status_code == 200
+    
+    response = grafana_session.get(f"{grafana_url}/api/datasources")
+    assert response.status_code == 200
+    
+    datasources = response.json()
+    # Should have at least Prometheus, Loki, and Tempo
+    assert len(datasources) >= 3
+
+
+@pytest.mark.parametrize("query", [
+    "up",
+    "up{job='homeassistant'}",
+    "scrape_samples_scraped",
+])
+def test_metrics_collection(http_session, prometheus_url, query):
+    """Test that metrics are being collected"""
+    response = http_session.get(
+        f"{prometheus_url}/api/v1/query",
+        params={'query': query}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data['status'] == 'success'
+    assert len(data['data']['result']) > 0
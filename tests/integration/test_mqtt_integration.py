@@ -2,20 +2,25 @@
 """Integration tests for MQTT broker"""
 import pytest
 import paho.mqtt.client as mqtt
+import threading
 import time
 import os
 
 
+MQTT_HOST = os.getenv('MQTT_HOST', 'mosquitto')
+
+pytestmark = pytest.mark.integration
+
+
 @pytest.fixture(scope="module")
 def mqtt_client():
     """Create MQTT client for integration tests"""
     client = mqtt.Client()
-    host = os.getenv('MQTT_HOST', 'mosquitto')
     
     max_retries = 5
     for attempt in range(max_retries):
         try:
-            client.connect(host, 1883, 60)
+            client.connect(MQTT_HOST, 1883, 60)
             client.loop_start()
             yield client
             client.loop_stop()
@@ -31,21 +36,32 @@ def mqtt_client():
 def test_mqtt_publish_subscribe(mqtt_client):
     """Test MQTT publish and subscribe functionality"""
     received_messages = []
+    subscribed = threading.Event()
+    received = threading.Event()
+    
+    def on_subscribe(client, userdata, mid, granted_qos):
+        subscribed.set()
     
     def on_message(client, userdata, msg):
         received_messages.append(msg.payload.decode())
+        received.set()
     
+    mqtt_client.on_subscribe = on_subscribe
     mqtt_client.on_message = on_message
-    mqtt_client.subscribe("test/integration")
+    mqtt_client.subscribe("test/integration", qos=1)
     
-    # Give subscription time to register
-    time.sleep(1)
+    # Wait for the broker's SUBACK instead of a fixed delay
+    assert subscribed.wait(5), "Subscription was not acknowledged"
     
-    # Publish test message
-    mqtt_client.publish("test/integration", "integration test message")
+    # Publish with QoS 1 so the broker's PUBACK tells us when it is accepted
+    info = mqtt_client.publish(
+        "test/integration", "integration test message", qos=1
+    )
+    info.wait_for_publish(5)
+    assert info.is_published(), "Publish was not acknowledged"
     
     # Wait for message
-    time.sleep(2)
+    assert received.wait(5), "Message was not received"
     
     assert len(received_messages) > 0
     assert "integration test message" in received_messages
@@ -1,358 +0,0 @@
-# tests/unit/test_mqtt_connection.py
-"""Unit tests for MQTT connection handling"""
-import pytest
-from unittest.mock import Mock, patch
-import paho.mqtt.client as mqtt
-
-
-class MQTTConnection:
-    def __init__(self, host, port=1883):
-        self.host = host
-        self.port = port
-        self.client = None
-        self.connected = False
-
-    def connect(self):
-        self.client = mqtt.Client()
-        self.client.connect(self.host, self.port)
-        self.connected = True
-        return True
-
-
-@pytest.fixture
-def mqtt_connection():
-    return MQTTConnection("mosquitto")
-
-
-def test_mqtt_initialization(mqtt_connection):
-    """Test MQTT connection object initialization"""
-    assert mqtt_connection.host == "mosquitto"
-    assert mqtt_connection.port == 1883
-    assert mqtt_connection.connected is False
-
-
-@patch('paho.mqtt.client.Client')
-def test_mqtt_connect(mock_client, mqtt_connection):
-    """Test MQTT connection establishment"""
-    mqtt_connection.connect()
-    assert mqtt_connection.connected is True
-    mock_client.assert_called_once()
-
-
-# tests/integration/test_postgres_integration.py
-"""Integration tests for PostgreSQL database"""
-import pytest
-import psycopg2
-import os
-import time
-
-
-@pytest.fixture(scope="module")
-def db_connection():
-    """Create database connection for integration tests"""
-    max_retries = 5
-    retry_delay = 2
-    
-    for attempt in range(max_retries):
-        try:
-            conn = psycopg2.connect(
-                host=os.getenv('POSTGRES_HOST', 'postgres'),
-                database='homeassistant',
-                user='hauser',
-                password=os.getenv('POSTGRES_PASSWORD', 'changeme')
-            )
-            yield conn
-            conn.close()
-            return
-        except psycopg2.OperationalError:
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-            else:
-                raise
-
-
-def test_database_connection(db_connection):
-    """Test database connectivity"""
-    cursor = db_connection.cursor()
-    cursor.execute("SELECT version();")
-    result = cursor.fetchone()
-    assert result is not None
-    assert 'PostgreSQL' in result[0]
-
-
-def test_database_tables_exist(db_connection):
-    """Test that required tables exist"""
-    cursor = db_connection.cursor()
-    cursor.execute("""
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = 'public'
-    """)
-    tables = [row[0] for row in cursor.fetchall()]
-    # Home Assistant creates tables on first run
-    # This test verifies the database is ready to accept tables
-    assert isinstance(tables, list)
-
-
-def test_database_write_read(db_connection):
-    """Test writing and reading from database"""
-    cursor = db_connection.cursor()
-    
-    # Create test table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS test_data (
-            id SERIAL PRIMARY KEY,
-            message TEXT
-        )
-    """)
-    db_connection.commit()
-    
-    # Insert test data
-    cursor.execute(
-        "INSERT INTO test_data (message) VALUES (%s) RETURNING id",
-        ('integration test',)
-    )
-    test_id = cursor.fetchone()[0]
-    db_connection.commit()
-    
-    # Read back data
-    cursor.execute("SELECT message FROM test_data WHERE id = %s", (test_id,))
-    result = cursor.fetchone()
-    
-    assert result is not None
-    assert result[0] == 'integration test'
-    
-    # Cleanup
-    cursor.execute("DROP TABLE test_data")
-    db_connection.commit()
-
-
-# tests/integration/test_mqtt_integration.py
-"""Integration tests for MQTT broker"""
-import pytest
-import paho.mqtt.client as mqtt
-import time
-import os
-
-
-@pytest.fixture(scope="module")
-def mqtt_client():
-    """Create MQTT client for integration tests"""
-    client = mqtt.Client()
-    host = os.getenv('MQTT_HOST', 'mosquitto')
-    
-    max_retries = 5
-    for attempt in range(max_retries):
-        try:
-            client.connect(host, 1883, 60)
-            client.loop_start()
-            yield client
-            client.loop_stop()
-            client.disconnect()
-            return
-        except Exception:
-            if attempt < max_retries - 1:
-                time.sleep(2)
-            else:
-                raise
-
-
-def test_mqtt_publish_subscribe(mqtt_client):
-    """Test MQTT publish and subscribe functionality"""
-    received_messages = []
-    
-    def on_message(client, userdata, msg):
-        received_messages.append(msg.payload.decode())
-    
-    mqtt_client.on_message = on_message
-    mqtt_client.subscribe("test/integration")
-    
-    # Give subscription time to register
-    time.sleep(1)
-    
-    # Publish test message
-    mqtt_client.publish("test/integration", "integration test message")
-    
-    # Wait for message
-    time.sleep(2)
-    
-    assert len(received_messages) > 0
-    assert "integration test message" in received_messages
-
-
-# tests/e2e/test_homeassistant_bdd.py
-"""BDD-style end-to-end tests for Home Assistant"""
-import pytest
-from pytest_bdd import scenarios, given, when, then, parsers
-import requests
-import time
-import os
-
-
-# Load BDD scenarios
-scenarios('../features/homeassistant.feature')
-
-
-@pytest.fixture
-def ha_url():
-    """Home Assistant base URL"""
-    return os.getenv('HA_URL', 'http://homeassistant:8123')
-
-
-@pytest.fixture
-def ha_session(ha_url):
-    """HTTP session for Home Assistant"""
-    session = requests.Session()
-    session.headers.update({
-        'Content-Type': 'application/json'
-    })
-    return session
-
-
-@given('Home Assistant is running')
-def home_assistant_running(ha_url, ha_session):
-    """Verify Home Assistant is accessible"""
-    max_retries = 10
-    for attempt in range(max_retries):
-        try:
-            response = ha_session.get(ha_url, timeout=5)
-            if response.status_code in [200, 401]:  # 401 means running but needs auth
-                return True
-        except requests.RequestException:
-            if attempt < max_retries - 1:
-                time.sleep(3)
-            else:
-                raise
-    pytest.fail("Home Assistant is not accessible")
-
-
-@when('I check the Home Assistant API status')
-def check_api_status(ha_url, ha_session):
-    """Check Home Assistant API status"""
-    response = ha_session.get(f"{ha_url}/api/", timeout=10)
-    assert response.status_code in [200, 401]
-
-
-@then('the API should be responsive')
-def api_responsive(ha_url, ha_session):
-    """Verify API responds"""
-    response = ha_session.get(f"{ha_url}/api/", timeout=10)
-    assert response.status_code in [200, 401]
-
-
-@given('MQTT broker is running')
-def mqtt_broker_running():
-    """Verify MQTT broker is accessible"""
-    import paho.mqtt.client as mqtt
-    client = mqtt.Client()
-    try:
-        client.connect(os.getenv('MQTT_HOST', 'mosquitto'), 1883, 60)
-        client.disconnect()
-        return True
-    except Exception as e:
-        pytest.fail(f"MQTT broker not accessible: {e}")
-
-
-@when(parsers.parse('I publish message "{message}" to topic "{topic}"'))
-def publish_mqtt_message(message, topic):
-    """Publish MQTT message"""
-    import paho.mqtt.client as mqtt
-    client = mqtt.Client()
-    client.connect(os.getenv('MQTT_HOST', 'mosquitto'), 1883, 60)
-    client.publish(topic, message)
-    client.disconnect()
-
-
-@then('the message should be delivered successfully')
-def message_delivered():
-    """Verify message delivery"""
-    # In a real scenario, you'd verify through subscription
-    assert True
-
-
-# tests/e2e/test_observability_stack.py
-"""End-to-end tests for observability stack"""
-import pytest
-import requests
-import time
-
-
-@pytest.fixture
-def prometheus_url():
-    return "http://prometheus:9090"
-
-
-@pytest.fixture
-def grafana_url():
-    return "http://grafana:3000"
-
-
-def test_prometheus_targets_healthy(prometheus_url):
-    """Test that Prometheus can scrape all targets"""
-    time.sleep(10)  # Wait for initial scrape
-    
-    response = requests.get(f"{prometheus_url}/api/v1/targets")
-    assert response.status_code == 200
-    
-    data = response.json()
-    active_targets = data['data']['activeTargets']
-    
-    # Check that we have targets configured
-    assert len(active_targets) > 0
-    
-    # Check for healthy targets
-    healthy_targets = [t for t in active_targets if t['health'] == 'up']
-    assert len(healthy_targets) > 0
-
-
-def test_grafana_datasources_configured(grafana_url):
-    """Test that Grafana has datasources configured"""
-    response = requests.get(
-        f"{grafana_url}/api/datasources",
-        auth=('admin', 'changeme')
-    )
-    assert response.status_code == 200
-    
-    datasources = response.json()
-    # Should have at least Prometheus, Loki, and Tempo
-    assert len(datasources) >= 3
-
-
-def test_metrics_collection():
-    """Test that metrics are being collected"""
-    prometheus_url = "http://prometheus:9090"
-    
-    # Query for container metrics
-    response = requests.get(
-        f"{prometheus_url}/api/v1/query",
-        params={'query': 'up'}
-    )
-    
-    assert response.status_code == 200
-    data = response.json()
-    assert data['status'] == 'success'
-    assert len(data['data']['result']) > 0
-
-
-# tests/features/homeassistant.feature
-"""
-Feature: Home Assistant Platform
-  As a platform engineer
-  I want to ensure all services are healthy
-  So that the home automation system works reliably
-
-  Scenario: Home Assistant is accessible
-    Given Home Assistant is running
-    When I check the Home Assistant API status
-    Then the API should be responsive
-
-  Scenario: MQTT messaging works
-    Given MQTT broker is running
-    When I publish message "test" to topic "test/e2e"
-    Then the message should be delivered successfully
-
-  Scenario: Database is operational
-    Given PostgreSQL is running
-    When I execute a test query
-    Then the query should return results
-"""
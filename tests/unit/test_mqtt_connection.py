@@ -1,27 +1,33 @@
 # tests/unit/test_mqtt_connection.py
 """Unit tests for MQTT connection handling"""
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 import paho.mqtt.client as mqtt
 
 
 class MQTTConnection:
-    def __init__(self, host, port=1883):
+    def __init__(self, host, port=1883, client_factory=mqtt.Client):
         self.host = host
         self.port = port
+        self.client_factory = client_factory
         self.client = None
         self.connected = False
 
     def connect(self):
-        self.client = mqtt.Client()
+        self.client = self.client_factory()
         self.client.connect(self.host, self.port)
         self.connected = True
         return True
 
 
 @pytest.fixture
-def mqtt_connection():
-    return MQTTConnection("mosquitto")
+def client_factory():
+    return Mock()
+
+
+@pytest.fixture
+def mqtt_connection(client_factory):
+    return MQTTConnection("mosquitto", client_factory=client_factory)
 
 
 def test_mqtt_initialization(mqtt_connection):
@@ -31,9 +37,9 @@ def test_mqtt_initialization(mqtt_connection):
     assert mqtt_connection.connected is False
 
 
-@patch('paho.mqtt.client.Client')
-def test_mqtt_connect(mock_client, mqtt_connection):
+def test_mqtt_connect(client_factory, mqtt_connection):
     """Test MQTT connection establishment"""
     mqtt_connection.connect()
     assert mqtt_connection.connected is True
-    mock_client.assert_called_once()
+    client_factory.assert_called_once()
+    mqtt_connection.client.connect.assert_called_once_with("mosquitto", 1883)
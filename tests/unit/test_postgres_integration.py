@@ -1,33 +1,29 @@
 # tests/integration/test_postgres_integration.py
 """Integration tests for PostgreSQL database"""
+from psycopg2.extras import execute_batch, execute_values
+import io
 import pytest
-import psycopg2
-import os
-import time
 
 
-@pytest.fixture(scope="module")
-def db_connection():
-    """Create database connection for integration tests"""
-    max_retries = 5
-    retry_delay = 2
-    
-    for attempt in range(max_retries):
-        try:
-            conn = psycopg2.connect(
-                host=os.getenv('POSTGRES_HOST', 'postgres'),
-                database='homeassistant',
-                user='hauser',
-                password=os.getenv('POSTGRES_PASSWORD', 'changeme')
-            )
-            yield conn
-            conn.close()
-            return
-        except psycopg2.OperationalError:
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-            else:
-                raise
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+def test_table(db_connection, worker_table_prefix):
+    """Create a scratch table private to this xdist worker"""
+    table = f"{worker_table_prefix}_data"
+    cursor = db_connection.cursor()
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id SERIAL PRIMARY KEY,
+            message TEXT
+        )
+    """)
+    db_connection.commit()
+    yield table
+    db_connection.rollback()
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    db_connection.commit()
 
 
 def test_database_connection(db_connection):
@@ -53,35 +49,74 @@ def test_database_tables_exist(db_connection):
     assert isinstance(tables, list)
 
 
-def test_database_write_read(db_connection):
-    """Test writing and reading from database"""
+def test_database_write_read(db_connection, test_table):
+    """Test bulk writing and reading from database"""
     cursor = db_connection.cursor()
     
-    # Create test table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS test_data (
-            id SERIAL PRIMARY KEY,
-            message TEXT
-        )
-    """)
-    db_connection.commit()
-    
-    # Insert test data
-    cursor.execute(
-        "INSERT INTO test_data (message) VALUES (%s) RETURNING id",
-        ('integration test',)
+    # Bulk insert test data, the way the HA recorder writes states in batches
+    messages = [('integration test %d' % i,) for i in range(10_000)]
+    ids = execute_values(
+        cursor,
+        f"INSERT INTO {test_table} (message) VALUES %s RETURNING id",
+        messages,
+        page_size=1000,
+        fetch=True
     )
-    test_id = cursor.fetchone()[0]
     db_connection.commit()
+    assert len(ids) == len(messages)
     
     # Read back data
-    cursor.execute("SELECT message FROM test_data WHERE id = %s", (test_id,))
+    cursor.execute(f"SELECT message FROM {test_table} WHERE id = %s", (ids[0][0],))
     result = cursor.fetchone()
     
     assert result is not None
-    assert result[0] == 'integration test'
+    assert result[0] == 'integration test 0'
+
+
+def test_database_bulk_copy_from(db_connection, test_table):
+    """Test bulk loading rows into the database with COPY"""
+    cursor = db_connection.cursor()
+    
+    messages = ['integration test %d' % i for i in range(10_000)]
+    cursor.copy_from(
+        io.StringIO("\n".join(messages)),
+        test_table,
+        columns=('message',)
+    )
+    db_connection.commit()
+    
+    cursor.execute(f"SELECT count(*) FROM {test_table}")
+    assert cursor.fetchone()[0] == len(messages)
+
+
+@pytest.mark.slow
+def test_database_bulk_copy(db_connection, test_table):
+    """Test streaming a recorder-sized CSV batch with COPY FROM STDIN"""
+    cursor = db_connection.cursor()
     
-    # Cleanup
-    cursor.execute("DROP TABLE test_data")
+    buf = io.StringIO("\n".join(f"msg{i}" for i in range(100_000)))
+    cursor.copy_expert(
+        f"COPY {test_table} (message) FROM STDIN WITH CSV",
+        buf
+    )
     db_connection.commit()
+    
+    cursor.execute(f"SELECT count(*) FROM {test_table}")
+    assert cursor.fetchone()[0] == 100_000
+
 
+def test_database_prepared_statement(db_connection, test_table):
+    """Test repeated inserts through a server-side prepared statement"""
+    cursor = db_connection.cursor()
+    
+    # Parse and plan the INSERT once, then batch the EXECUTE round-trips
+    cursor.execute(
+        f"PREPARE ins AS INSERT INTO {test_table} (message) VALUES ($1)"
+    )
+    messages = [('integration test %d' % i,) for i in range(1000)]
+    execute_batch(cursor, "EXECUTE ins (%s)", messages, page_size=100)
+    cursor.execute("DEALLOCATE ins")
+    db_connection.commit()
+    
+    cursor.execute(f"SELECT count(*) FROM {test_table}")
+    assert cursor.fetchone()[0] == len(messages)